@@ -0,0 +1,37 @@
+"""
+Game State
+
+The OCR'd table state and its JSON form. Kept free of OCR imports so the
+overlay process can use it without loading easyocr, torch or mss.
+"""
+import orjson
+
+class GameState:
+    def __init__(self):
+        self.pot = "N/A"
+        self.board = []
+        self.hero_cards = []
+        self.players = {}
+
+    def update_pot(self, v): self.pot = v
+    def update_board(self, v): self.board = v
+    def update_hero_cards(self, v): self.hero_cards = v
+    def update_players(self, bankrolls, vpips, positions, actions, bets):
+        self.players = {}
+        for name in bankrolls.keys():
+            self.players[name] = {
+                "bankroll": bankrolls.get(name, "N/A"),
+                "vpip": vpips.get(name, "--"),
+                "position": positions.get(name, "--"),
+                "action": actions.get(name, "--"),
+                "bet": bets.get(name, "N/A"),
+            }
+
+    def to_json(self) -> str:
+        state = {
+            "pot": self.pot,
+            "board": self.board,
+            "hero_cards": self.hero_cards,
+            "players": self.players,
+        }
+        return orjson.dumps(state).decode()
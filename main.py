@@ -7,11 +7,15 @@ learning for decision making.
 """
 import tkinter as tk
 import threading
+import queue
 import time
-import json
 import atexit
-from collections import deque
-from ocr import OCR, GameState
+import importlib.util
+from functools import lru_cache
+from collections import defaultdict, deque
+from tkthread import TkThread
+from game_state import GameState
+from ocr_worker import OCRProcess
 import ml_pipeline
 from rl_poker_bot import PokerRLBot
 
@@ -20,20 +24,34 @@ UPDATE_INTERVAL_FAST = 500    # When cards are dealt
 UPDATE_INTERVAL_NORMAL = 1000 # Normal gameplay
 UPDATE_INTERVAL_SLOW = 2000   # Waiting for new hand
 
+# Overlay rows, each with its own label so only changed rows are redrawn
+OVERLAY_ROWS = ('pot', 'board', 'hero', 'stack', 'decision', 'status')
+
+ACTION_EMOJI = {'RAISE': '🚀', 'FOLD': '🛑', 'CALL': '✅', 'WAIT': '⏳'}.get
+
+def _state_key(state):
+    """Hash the fields that decide whether the overlay needs redrawing"""
+    return hash((state['pot'], tuple(state['board']), tuple(state['hero_cards'])))
+
 class PerformanceMonitor:
     def __init__(self):
-        self.timings = deque(maxlen=50)
+        self.timings = defaultdict(lambda: deque(maxlen=50))  # per operation
+        self.sums = defaultdict(float)
         self.bottleneck_threshold = 1.0  # sec
         
     def record_timing(self, operation, duration):
-        self.timings.append((operation, duration, time.time()))
+        timings = self.timings[operation]
+        if len(timings) == timings.maxlen:
+            self.sums[operation] -= timings[0]
+        timings.append(duration)
+        self.sums[operation] += duration
         if duration > self.bottleneck_threshold:
             print(f"BOTTLENECK: {operation} took {duration:.2f}s")
     
     def get_average_timing(self, operation):
-        recent_timings = [t for t in self.timings if t[0] == operation and time.time() - t[2] < 30]
-        if recent_timings:
-            return sum(t[1] for t in recent_timings) / len(recent_timings)
+        timings = self.timings.get(operation)
+        if timings:
+            return self.sums[operation] / len(timings)
         return 0
 
 class PokerOverlay:
@@ -44,24 +62,31 @@ class PokerOverlay:
         self.root.geometry("380x300+50+50")
         self.root.configure(bg='black')
         self.root.wm_attributes("-alpha", 0.85)
+        self._tkt = TkThread(self.root)
 
-        self.text = tk.StringVar()
-        self.text.set("Initializing Optimized Poker RL Bot...")
+        self.frame = tk.Frame(self.root, bg='black')
+        self.frame.pack(padx=10, pady=10, anchor='w')
         
-        self.label = tk.Label(
-            self.root,
-            textvariable=self.text,
-            fg='cyan',
-            bg='black',
-            font=("Consolas", 9),
-            justify="left",
-            wraplength=360
-        )
-        self.label.pack(padx=10, pady=10)
+        self.rows = {}
+        self._row_text = {}
+        for name in OVERLAY_ROWS:
+            self.rows[name] = tk.StringVar()
+            self._row_text[name] = ""
+            tk.Label(
+                self.frame,
+                textvariable=self.rows[name],
+                fg='cyan',
+                bg='black',
+                font=("Consolas", 9),
+                justify="left",
+                wraplength=360
+            ).pack(anchor='w', pady=(12, 0) if name in ('decision', 'status') else 0)
+        
+        self._row_text['pot'] = "Initializing Optimized Poker RL Bot..."
+        self.rows['pot'].set(self._row_text['pot'])
 
         # Thread management
-        self.worker_running = False
-        self.worker_lock = threading.Lock()
+        self._tick_q = queue.Queue(maxsize=1)
         self.consecutive_errors = 0
         
         self.perf_monitor = PerformanceMonitor()
@@ -70,7 +95,7 @@ class PokerOverlay:
         
         # Initialize 
         self.game_state = GameState()
-        self.ocr = OCR(self.game_state)
+        self.ocr = OCRProcess(self.game_state)
         
         print("Starting RL Bot...")
         self.rl_bot = PokerRLBot()
@@ -78,10 +103,18 @@ class PokerOverlay:
         # tracking the performence
         self.update_count = 0
         self.hands_seen = 0
-        self.last_game_state = None
+        self._last_state_key = None
+        self._cleaned_key = None
+        self._last_cleaned = None
+        
+        # Memoized RL decisions, cleared whenever new hole cards are dealt
+        self._solve_state = None
+        self._solved_hero = None
+        self._solve_cached = lru_cache(maxsize=512)(self._solve_for_key)
         
         atexit.register(self.cleanup)
 
+        threading.Thread(target=self._worker_loop, daemon=True).start()
         self.root.after(1000, self.update_overlay)
 
     def get_dynamic_interval(self):
@@ -93,146 +126,172 @@ class PokerOverlay:
         else:
             return UPDATE_INTERVAL_SLOW
 
-    def update_overlay(self):
-        def worker():
-            if not self.worker_lock.acquire(blocking=False):
-                return              # Skip if another worker is running
+    def _worker_loop(self):
+        """Process overlay ticks on one long-lived thread"""
+        while True:
+            self._tick_q.get()
+            try:
+                self._worker_tick()
+            except Exception as e:
+                # Keep the only worker alive so the next tick still runs
+                print(f"Worker tick failed: {e}")
+
+    def _worker_tick(self):
+        worker_start_time = time.time()
+        
+        try:
+            ocr_start = time.time()
+            json_state = self.ocr.refresh_all()
+            ocr_duration = time.time() - ocr_start
+            self.perf_monitor.record_timing("OCR", ocr_duration)
             
-            self.worker_running = True
-            worker_start_time = time.time()
+            current_state = {
+                'pot': self.game_state.pot,
+                'board': self.game_state.board,
+                'hero_cards': self.game_state.hero_cards,
+                'players': self.game_state.players
+            }
             
-            try:
-                ocr_start = time.time()
-                json_state = self.ocr.refresh_all()
-                ocr_duration = time.time() - ocr_start
-                self.perf_monitor.record_timing("OCR", ocr_duration)
-                
-                current_state = {
-                    'pot': self.game_state.pot,
-                    'board': self.game_state.board,
-                    'hero_cards': self.game_state.hero_cards,
-                    'players': self.game_state.players
-                }
-                
-                # Skip processing if state unchanged and no JSON update
-                if not json_state and self.state_unchanged(current_state):
-                    self.display_cached_state()
-                    return
-                
-                # ML pipeline cleaning
+            state_key = _state_key(current_state)
+            
+            # Skip processing if state unchanged and no JSON update
+            if not json_state and self.state_unchanged(state_key):
+                self.display_cached_state()
+                return
+            
+            # ML pipeline cleaning, reused while OCR reports no change
+            if not json_state and state_key == self._cleaned_key:
+                cleaned_state = self._last_cleaned
+            else:
                 pipeline_start = time.time()
-                current_json = json.dumps(current_state, ensure_ascii=False)
-                cleaned_state = ml_pipeline.clean_game_state(current_json)
+                cleaned_state = ml_pipeline.clean_game_state_dict(current_state)
                 pipeline_duration = time.time() - pipeline_start
                 self.perf_monitor.record_timing("ML_Pipeline", pipeline_duration)
+                self._cleaned_key = state_key
+                self._last_cleaned = cleaned_state
 
-                if not cleaned_state:
-                    self.text.set("Waiting for poker table...\n\nMake sure poker client is visible\nand you're seated at a table")
-                    return
+            if not cleaned_state:
+                self._show_message("Waiting for poker table...\n\nMake sure poker client is visible\nand you're seated at a table")
+                return
 
-                hero_cards = cleaned_state.get('hero_cards', [])
-                board = cleaned_state.get('board', [])
-                pot = cleaned_state.get('pot', 'N/A')
+            hero_cards = cleaned_state.get('hero_cards', [])
+            board = cleaned_state.get('board', [])
+            pot = cleaned_state.get('pot', 'N/A')
+            
+            hero_info = cleaned_state.get('players', {}).get('Hero', {})
+            position = hero_info.get('position', '--')
+            bankroll = hero_info.get('bankroll', 'N/A')
+            
+            # Build the display overlay
+            rows = {
+                'pot': f"Pot: {pot}",
+                'board': f"Board: {', '.join(board) if board else 'None'}",
+                'hero': f"Hero ({position}): {', '.join(hero_cards) if hero_cards else 'None'}",
+                'stack': f"Stack: {bankroll}",
+                'status': ""
+            }
+            
+            # Get RL recommendation with timing
+            if len(hero_cards) == 2:
+                hero_key = tuple(hero_cards)
+                if hero_key != self._solved_hero:
+                    self._solve_cached.cache_clear()
+                    self._solved_hero = hero_key
                 
-                hero_info = cleaned_state.get('players', {}).get('Hero', {})
-                position = hero_info.get('position', '--')
-                bankroll = hero_info.get('bankroll', 'N/A')
+                solve_key = (
+                    round(float(pot or 0), 1), tuple(board), hero_key, position,
+                    self.rl_bot._count_active_opponents(cleaned_state.get('players', {}))
+                )
+                self._solve_state = cleaned_state
+                decision = self._solve_cached(solve_key)
+
+                action = decision.get('best_action', 'CALL')
+                confidence = decision.get('confidence', 0.5)
+                hand_strength = decision.get('hand_strength', 0.0)
+                states_learned = decision.get('states_learned', 0)
                 
-                # Build the display overlay
-                display = f"Pot: {pot}\n"
-                display += f"Board: {', '.join(board) if board else 'None'}\n"
-                display += f"Hero ({position}): {', '.join(hero_cards) if hero_cards else 'None'}\n"
-                display += f"Stack: {bankroll}\n\n"
+                # Action display
+                rows['decision'] = "\n".join((
+                    f"{ACTION_EMOJI(action, '❓')} Recommendation: {action}",
+                    f"Confidence: {confidence:.1%}",
+                    f"Hand Strength: {hand_strength:.1%}",
+                    "",
+                    "Learning Progress:",
+                    f"States: {states_learned}",
+                    f"Hands: {self.rl_bot.total_hands_played}"
+                ))
                 
-                # Get RL recommendation with timing
-                if len(hero_cards) == 2:
-                    rl_start = time.time()
-                    decision = self.rl_bot.solve(cleaned_state)
-                    rl_duration = time.time() - rl_start
-                    self.perf_monitor.record_timing("RL_Bot", rl_duration)
+                # Count hands 
+                if json_state:
+                    self.hands_seen += 1
+            
+            else:
+                # Active players: the pipeline already dropped empty seats
+                rows['decision'] = "\n".join((
+                    "Waiting for cards...",
+                    "",
+                    "Bot Learning Status:",
+                    f"States Learned: {len(self.rl_bot.q_table)}",
+                    f"Total Hands: {self.rl_bot.total_hands_played}",
+                    f"Players: {len(cleaned_state.get('players', {}))}"
+                ))
 
-                    action = decision.get('best_action', 'CALL')
-                    confidence = decision.get('confidence', 0.5)
-                    hand_strength = decision.get('hand_strength', 0.0)
-                    states_learned = decision.get('states_learned', 0)
-                    
-                    # Action display
-                    action_emoji = {
-                        'RAISE': '🚀', 'FOLD': '🛑', 'CALL': '✅', 'WAIT': '⏳'
-                    }
-                    
-                    display += f"{action_emoji.get(action, '❓')} Recommendation: {action}\n"
-                    display += f"Confidence: {confidence:.1%}\n"
-                    display += f"Hand Strength: {hand_strength:.1%}\n\n"
-                    display += f"Learning Progress:\n"
-                    display += f"States: {states_learned}\n"
-                    display += f"Hands: {self.rl_bot.total_hands_played}"
-                    
-                    # Count hands 
-                    if json_state:
-                        self.hands_seen += 1
-                
-                else:
-                    display += "Waiting for cards...\n\n"
-                    display += "Bot Learning Status:\n"
-                    display += f"States Learned: {len(self.rl_bot.q_table)}\n"
-                    display += f"Total Hands: {self.rl_bot.total_hands_played}\n"
-                    
-                    # Show active players
-                    try:
-                        active_players = len([
-                            p for p in cleaned_state.get('players', {}).values() 
-                            if p.get('bankroll', 'N/A') != 'N/A'
-                        ])
-                        display += f"Players: {active_players}"
-                    except:
-                        display += "Players: --"
+            self.update_count += 1
+            total_time = time.time() - worker_start_time
+            
+            if self.update_count % 10 == 0 or total_time > 2.0:
+                ocr_avg = self.perf_monitor.get_average_timing("OCR")
+                rows['status'] = f"Perf: Total {total_time:.1f}s"
+                if ocr_avg > 1.0:
+                    rows['status'] += f", OCR avg: {ocr_avg:.1f}s"
+            
+            self._set_rows(**rows)
+            self._last_state_key = state_key
+            
+            self.consecutive_errors = 0
+            
+            self.current_update_interval = self.get_dynamic_interval()
+            
+        except Exception as e:
+            self.handle_error(e)
 
-                self.update_count += 1
-                total_time = time.time() - worker_start_time
-                
-                if self.update_count % 10 == 0 or total_time > 2.0:
-                    ocr_avg = self.perf_monitor.get_average_timing("OCR")
-                    display += f"\n\nPerf: Total {total_time:.1f}s"
-                    if ocr_avg > 1.0:
-                        display += f", OCR avg: {ocr_avg:.1f}s"
-                
-                self.text.set(display)
-                self.last_game_state = current_state.copy()
-                
-                self.consecutive_errors = 0
-                
-                self.current_update_interval = self.get_dynamic_interval()
-                
-            except Exception as e:
-                self.handle_error(e)
-                
-            finally:
-                self.worker_running = False
-                self.worker_lock.release()
+    def _solve_for_key(self, solve_key):
+        """Run the RL bot on the state solve_key was built from"""
+        rl_start = time.time()
+        decision = self.rl_bot.solve(self._solve_state)
+        rl_duration = time.time() - rl_start
+        self.perf_monitor.record_timing("RL_Bot", rl_duration)
+        return decision
 
+    def update_overlay(self):
         try:
-            threading.Thread(target=worker, daemon=True).start()
-        except Exception as e:
-            print(f"Failed to start worker thread: {e}")
+            self._tick_q.put_nowait(None)
+        except queue.Full:
+            pass                    # Worker still busy with the previous tick
         
         self.root.after(self.current_update_interval, self.update_overlay)
 
-    def state_unchanged(self, current_state):
+    def _set_rows(self, **rows):
+        """Hand changed rows from the worker to the Tk thread without blocking"""
+        for name, text in rows.items():
+            if self._row_text[name] != text:
+                self._row_text[name] = text
+                self._tkt.nosync(self.rows[name].set, text)
+
+    def _show_message(self, text):
+        """Replace the whole overlay with a message in the first row"""
+        self._last_state_key = None  # The rows are gone, so the next tick redraws in full
+        rows = dict.fromkeys(OVERLAY_ROWS, "")
+        rows[OVERLAY_ROWS[0]] = text
+        self._set_rows(**rows)
+
+    def state_unchanged(self, state_key):
         """Check if game state has changed significantly"""
-        if not self.last_game_state:
-            return False
-            
-        key_fields = ['pot', 'board', 'hero_cards']
-        for field in key_fields:
-            if current_state.get(field) != self.last_game_state.get(field):
-                return False
-        return True
+        return state_key == self._last_state_key
 
     def display_cached_state(self):
         """Show cached info when state hasn't changed"""
-        if hasattr(self, '_cached_display'):
-            self.text.set(self._cached_display + f"\n\n[Cached - no changes detected]")
+        self._set_rows(status="[Cached - no changes detected]")
 
     def handle_error(self, error):
         """Enhanced error handling with recovery"""
@@ -253,7 +312,7 @@ class PokerOverlay:
             error_msg += "Many errors - check setup"
             self.current_update_interval = 5000  
         
-        self.text.set(error_msg)
+        self._show_message(error_msg)
         
         print(f"Worker error (#{self.consecutive_errors}): {error}")
         if self.consecutive_errors <= 2: 
@@ -262,6 +321,14 @@ class PokerOverlay:
 
     def cleanup(self):
         """Save RL progress when closing"""
+        # Registered with atexit and also called from run(), only save once
+        if getattr(self, '_cleaned_up', False):
+            return
+        self._cleaned_up = True
+        
+        if hasattr(self, 'ocr'):
+            self.ocr.close()
+            
         if hasattr(self, 'rl_bot'):
             print("Saving RL progress...")
             try:
@@ -291,14 +358,21 @@ def check_basic_dependencies():
     """Check basic requirements only"""
     try:
         import numpy
-        import cv2
-        import easyocr
-        print("Dependencies OK")
-        return True
+        import tkthread
+        import orjson
     except ImportError as e:
         print(f"Missing dependency: {e}")
-        print("Install with: pip install numpy opencv-python easyocr")
+        print("Install with: pip install numpy opencv-python easyocr tkthread orjson mss")
+        return False
+    
+    # OCR libraries are only loaded by the OCR process, so just locate them here
+    missing = [m for m in ("cv2", "easyocr", "mss") if importlib.util.find_spec(m) is None]
+    if missing:
+        print(f"Missing dependency: {', '.join(missing)}")
+        print("Install with: pip install numpy opencv-python easyocr tkthread orjson mss")
         return False
+    print("Dependencies OK")
+    return True
 
 if __name__ == "__main__":
     print("Optimized Poker RL Bot Starting...")
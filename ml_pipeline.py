@@ -4,6 +4,33 @@ from typing import Dict, List, Optional, Union
 
 VALID_CARD_PATTERN = re.compile(r'^(A|K|Q|J|10|[2-9])[♠♥♦♣]$')
 VALID_POSITION_PATTERN = re.compile(r'^(BTN|SB|BB|UTG|MP|CO|HJ)$')
+SUIT_WORD_PATTERN = re.compile(r'(SPADE|HEART|DIAMOND|CLUB)S?$')
+
+# Canonical rank-then-suit order of the 52 cards: A♠ -> 0, A♥ -> 1, ...
+CARD_ORDER = {
+    card: i for i, card in enumerate(
+        rank + suit
+        for rank in ['A', 'K', 'Q', 'J', '10', '9', '8', '7', '6', '5', '4', '3', '2']
+        for suit in '♠♥♦♣'
+    )
+}
+VALID_CARDS = frozenset(CARD_ORDER)
+
+NUMBER_PATTERN = re.compile(r'\d+\.?\d*')
+CURRENCY_PATTERN = re.compile(r'[$,\s]')
+
+_SUIT_TRANS = str.maketrans({'S': '♠', 'H': '♥', 'D': '♦', 'C': '♣'})
+
+# Common OCR misreads of card values; only ever applied to the value slice
+_VALUE_TRANS = str.maketrans({
+    '0': 'Q',    # 0 often mistaken for Q
+    'O': 'Q',    # O often mistaken for Q
+    'I': '1',    # I often mistaken for 1
+    'L': '1',    # L often mistaken for 1
+    'S': '5',    # S often mistaken for 5
+    'B': '8',    # B often mistaken for 8
+    'G': '6',    # G often mistaken for 6
+})
 
 def clean_game_state(json_state: str) -> Optional[Dict]:
     """
@@ -18,6 +45,10 @@ def clean_game_state(json_state: str) -> Optional[Dict]:
         print(f"JSON decode error: {e}")
         return None
     
+    return clean_game_state_dict(data)
+
+def clean_game_state_dict(data: Dict) -> Optional[Dict]:
+    """Clean a game state that is already in memory, skipping the JSON round-trip"""
     if not isinstance(data, dict):
         print("Invalid data format: expected dictionary")
         return None
@@ -40,7 +71,7 @@ def clean_pot_value(pot_value) -> Union[float, str]:
         return 0.0
     
     if isinstance(pot_value, str):
-        clean_pot = pot_value.replace('$', '').replace(',', '').replace(' ', '')
+        clean_pot = CURRENCY_PATTERN.sub('', pot_value)
         
         if clean_pot == '' or clean_pot.upper() == 'N/A':
             return 0.0
@@ -48,7 +79,7 @@ def clean_pot_value(pot_value) -> Union[float, str]:
         try:
             return float(clean_pot)
         except ValueError:
-            numbers = re.findall(r'\d+\.?\d*', clean_pot)
+            numbers = NUMBER_PATTERN.findall(clean_pot)
             if numbers:
                 try:
                     return float(numbers[0])
@@ -61,7 +92,7 @@ def clean_pot_value(pot_value) -> Union[float, str]:
         return 0.0
 
 def clean_card_list(card_list) -> List[str]:
-    """Clean and validate a list of cards"""
+    """Clean and validate a list of cards, sorted into canonical order"""
     if not isinstance(card_list, list):
         return []
     
@@ -71,20 +102,22 @@ def clean_card_list(card_list) -> List[str]:
         if cleaned_card:
             cleaned_cards.append(cleaned_card)
     
-    return cleaned_cards
+    # Reading order doesn't change the hand, so equal hands get equal lists
+    return sorted(cleaned_cards, key=CARD_ORDER.__getitem__)
 
 def clean_single_card(card) -> Optional[str]:
     """Clean and validate a single card"""
     if not isinstance(card, str):
         return None
     
-    card = card.strip()
-    
-    if not card or len(card) < 2:
-        return None
+    if card in VALID_CARDS:
+        return card
     
     card = normalize_card_format(card)
     
+    if len(card) < 2:
+        return None
+    
     if VALID_CARD_PATTERN.match(card):
         return card
     
@@ -95,56 +128,27 @@ def clean_single_card(card) -> Optional[str]:
     return None
 
 def normalize_card_format(card: str) -> str:
-    """Normalize card to standard format"""
-    card = card.upper().strip()
+    """Normalize card to standard format: T becomes 10 and suit letters or words become symbols"""
+    card = card.strip().upper()
+    if not card:
+        return card
     
-    if card.startswith('10'):
-        return '10' + card[2:]
-    elif card.startswith('T'):
-        return '10' + card[1:]
+    if card.startswith('T'):
+        card = '10' + card[1:]
     
     # Ensure proper suit symbols
-    suit_replacements = {
-        'S': '♠', 'SPADES': '♠', 'SPADE': '♠',
-        'H': '♥', 'HEARTS': '♥', 'HEART': '♥',
-        'D': '♦', 'DIAMONDS': '♦', 'DIAMOND': '♦',
-        'C': '♣', 'CLUBS': '♣', 'CLUB': '♣'
-    }
-    
-    for text_suit, symbol in suit_replacements.items():
-        if card.endswith(text_suit):
-            return card[:-len(text_suit)] + symbol
-    
-    return card
+    card = SUIT_WORD_PATTERN.sub(lambda m: m.group(1)[0], card)
+    return card[:-1] + card[-1].translate(_SUIT_TRANS)
 
 def repair_card_ocr_errors(card: str) -> Optional[str]:
     """Attempt to repair common OCR errors in card reading"""
     if len(card) < 2:
         return None
     
-    value_corrections = {
-        '0': 'Q',    # 0 often mistaken for Q
-        'O': 'Q',    # O often mistaken for Q
-        'I': '1',    # I often mistaken for 1 
-        'L': '1',    # L often mistaken for 1
-        'S': '5',    # S often mistaken for 5
-        'B': '8',    # B often mistaken for 8
-        'G': '6',    # G often mistaken for 6
-    }
-    
-    if len(card) >= 2:
-        value_part = card[:-1]
-        suit_part = card[-1]
-        
-        if value_part in value_corrections:
-            corrected_value = value_corrections[value_part]
-        else:
-            corrected_value = value_part
-        
-        corrected_card = corrected_value + suit_part
-        return normalize_card_format(corrected_card)
-    
-    return None
+    # Only single-character values are repaired so '10' is never touched
+    if len(card) == 2:
+        return card[0].translate(_VALUE_TRANS) + card[1]
+    return card
 
 def clean_players_data(players_data) -> Dict:
     """Clean and validate player data"""
@@ -162,17 +166,18 @@ def clean_players_data(players_data) -> Dict:
         if bankroll == 'N/A' or not bankroll:
             continue
         
-        cleaned_player = {
-            'bankroll': clean_bankroll_value(bankroll),
+        # Only include players with bankroll, checked before building the record
+        cleaned_bankroll = clean_bankroll_value(bankroll)
+        if cleaned_bankroll == 'N/A':
+            continue
+        
+        cleaned_players[str(player_name)] = {
+            'bankroll': cleaned_bankroll,
             'vpip': clean_vpip_value(player_info.get('vpip', '--')),
             'position': clean_position_value(player_info.get('position', '--')),
             'action': clean_action_value(player_info.get('action', '--')),
             'bet': clean_bet_value(player_info.get('bet', 'N/A'))
         }
-        
-        # Only include players with bankroll
-        if cleaned_player['bankroll'] != 'N/A':
-            cleaned_players[str(player_name)] = cleaned_player
     
     return cleaned_players
 
@@ -181,7 +186,7 @@ def clean_bankroll_value(bankroll) -> Union[str, float]:
     if bankroll is None or str(bankroll).strip() == '':
         return 'N/A'
     
-    bankroll_str = str(bankroll).replace('$', '').replace(',', '').strip()
+    bankroll_str = CURRENCY_PATTERN.sub('', str(bankroll))
     
     if bankroll_str.upper() == 'N/A' or bankroll_str == '':
         return 'N/A'
@@ -190,7 +195,7 @@ def clean_bankroll_value(bankroll) -> Union[str, float]:
         float(bankroll_str)
         return bankroll_str
     except ValueError:
-        numbers = re.findall(r'\d+\.?\d*', bankroll_str)
+        numbers = NUMBER_PATTERN.findall(bankroll_str)
         if numbers:
             return numbers[0]
         return 'N/A'
@@ -275,7 +280,7 @@ def clean_bet_value(bet) -> str:
     if bet is None:
         return 'N/A'
     
-    bet_str = str(bet).replace('$', '').replace(',', '').strip()
+    bet_str = CURRENCY_PATTERN.sub('', str(bet))
     
     if bet_str.upper() in ['N/A', '--', '']:
         return 'N/A'
@@ -284,7 +289,7 @@ def clean_bet_value(bet) -> str:
         float(bet_str)
         return bet_str
     except ValueError:
-        numbers = re.findall(r'\d+\.?\d*', bet_str)
+        numbers = NUMBER_PATTERN.findall(bet_str)
         if numbers:
             return numbers[0]
         return 'N/A'
@@ -326,9 +331,8 @@ def get_game_state_summary(state: Dict) -> str:
     hero_cards = state.get('hero_cards', [])
     summary.append(f"Hero ({len(hero_cards)}): {', '.join(hero_cards) if hero_cards else 'Empty'}")
     
-    players = state.get('players', {})
-    active_players = len([p for p in players.values() if p.get('bankroll') != 'N/A'])
-    summary.append(f"Players: {active_players} active")
+    # clean_players_data only keeps players with a bankroll
+    summary.append(f"Players: {len(state.get('players', {}))} active")
     
     return " | ".join(summary)
 
@@ -1,48 +1,76 @@
-import os, time, cv2, numpy as np, easyocr
-from PIL import ImageGrab
-from typing import Dict, List, Optional
+import os, re, sys, hashlib, threading, cv2, numpy as np, easyocr, mss
+from typing import Dict, List, Optional, Tuple
 from config import *
-import json 
+from ocr_onnx import OnnxRecognizer, REC_INT8_MODEL_PATH
+import ocr_kernels
+from game_state import GameState
 
 SCAN_DELAY = 0.15  
+OCR_BATCH_SIZE = 32   # Regions recognized per forward pass on GPU
+OCR_WARMUP_RUNS = 3
+STATE_PATH = "game_state.json"
+TABLE_HASH_SIZE = (128, 96)  # Thumbnail hashed to decide whether the table changed at all
+BLANK_STDDEV = 8.0  # Grayscale stddev below which a tile holds no text
 
-class GameState:
-    def __init__(self):
-        self.pot = "N/A"
-        self.board = []
-        self.hero_cards = []
-        self.players = {}
-
-    def update_pot(self, v): self.pot = v
-    def update_board(self, v): self.board = v
-    def update_hero_cards(self, v): self.hero_cards = v
-    def update_players(self, bankrolls, vpips, positions, actions, bets):
-        self.players = {}
-        for name in bankrolls.keys():
-            self.players[name] = {
-                "bankroll": bankrolls.get(name, "N/A"),
-                "vpip": vpips.get(name, "--"),
-                "position": positions.get(name, "--"),
-                "action": actions.get(name, "--"),
-                "bet": bets.get(name, "N/A"),
-            }
-
-    def to_json(self) -> str:
-        state = {
-            "pot": self.pot,
-            "board": self.board,
-            "hero_cards": self.hero_cards,
-            "players": self.players,
-        }
-        return json.dumps(state, indent=2, ensure_ascii=False)
+# A card value, or one of the ways OCR misreads one
+CARD_VALUE_PATTERN = re.compile(r'^\s*(10|TO|1O|IO|LO|[AKQJ2-9O0])\s*$', re.IGNORECASE)
+CARD_VALUE_FIXES = {
+    '0': 'Q',      # Zero often misread as Q
+    'O': 'Q',      # Letter O misread as Q
+    'TO': '10', '1O': '10', 'IO': '10', 'LO': '10',  # various ways OCR might see 10
+}
+# No word boundaries, so "folded", "raises" and "calls" still match
+ACTION_PATTERN = re.compile(r'fold|raise|call', re.IGNORECASE)
+ACTION_NAMES = {'fold': 'Fold', 'raise': 'Raise', 'call': 'Call'}
+ACTION_PRIORITY = ('raise', 'call')  # Checked after fold, whatever order the text is in
 
 class OCR:
+    _BOARD_REGIONS = (BOARD_CARD_1, BOARD_CARD_2, BOARD_CARD_3, BOARD_CARD_4, BOARD_CARD_5)
+    _BOARD_SUIT_REGIONS = (SUIT_CARD_1, SUIT_CARD_2, SUIT_CARD_3, SUIT_CARD_4, SUIT_CARD_5)
+    # (name, bankroll, vpip, position, action, bet) for every seat
+    _PLAYER_REGIONS = (
+        ("Hero", BANK_HERO, VPIP_HERO, POSITION_HERO, ACTION_HERO, BET_AMOUNT_HERO),
+        ("Player 2", BANK_PLAYER_2, VPIP_PLAYER_2, POSITION_PLAYER_2, ACTION_2, BET_AMOUNT_2),
+        ("Player 3", BANK_PLAYER_3, VPIP_PLAYER_3, POSITION_PLAYER_3, ACTION_3, BET_AMOUNT_3),
+        ("Player 4", BANK_PLAYER_4, VPIP_PLAYER_4, POSITION_PLAYER_4, ACTION_4, BET_AMOUNT_4),
+        ("Player 5", BANK_PLAYER_5, VPIP_PLAYER_5, POSITION_PLAYER_5, ACTION_5, BET_AMOUNT_5),
+        ("Player 6", BANK_PLAYER_6, VPIP_PLAYER_6, POSITION_PLAYER_6, ACTION_6, BET_AMOUNT_6),
+        ("Player 7", BANK_PLAYER_7, VPIP_PLAYER_7, POSITION_PLAYER_7, ACTION_7, BET_AMOUNT_7),
+    )
+    _SEAT_REGIONS = {row[0]: row[1:] for row in _PLAYER_REGIONS}
+    _BANK_REGIONS = tuple((row[0], row[1]) for row in _PLAYER_REGIONS)
+
+    # Mean tile colour of each suit and of the dealer button. Grabs are BGR,
+    # so these are BGR too; the old 'rgb' names were misleading
+    _SUIT_KEYS = ['♣', '♥', '♦', '♠']
+    _SUIT_PALETTE_BGR = np.array([[27, 108, 27], [21, 82, 145], [162, 32, 33], [41, 43, 41]], dtype=np.float32)
+    _BTN_BGR = np.array([99, 182, 231], dtype=np.float32)
+    _POSITION_LABELS = ("BTN", "SB", "BB", "UTG", "MP", "CO", "HJ")
+
     def __init__(self, game_state: GameState):
         self.state = game_state
+        self._sct = mss.mss()  # Reused for every screen grab
         
         print("starting OCR reader")
-        self.reader = easyocr.Reader(['en'], gpu=False, verbose=False)
-        print("OCR reader ready")
+        try:
+            self.reader = easyocr.Reader(['en'], gpu=True, verbose=False)
+        except Exception as e:
+            print(f"GPU OCR unavailable ({e}), falling back to CPU")
+            self.reader = easyocr.Reader(['en'], gpu=False, verbose=False)
+        
+        # Regions are already tight crops around the text, so the CRAFT detector
+        # never runs: every read goes through reader.recognize with explicit boxes
+        self.on_cpu = self.reader.device == 'cpu'
+        
+        # Quantized recognizer for CPU-only machines, see ocr_onnx.py
+        self.onnx_recognizer = None
+        if self.on_cpu and os.path.exists(REC_INT8_MODEL_PATH):
+            try:
+                self.onnx_recognizer = OnnxRecognizer(self.reader.converter)
+            except Exception as e:
+                print(f"Could not load ONNX recognizer: {e}")
+        
+        backend = "onnx int8" if self.onnx_recognizer else self.reader.device
 
         self.seated_players: List[str] = []
         self.bankrolls: Dict[str, str] = {}
@@ -50,26 +78,158 @@ class OCR:
         self.positions: Dict[str, str] = {}
         self.actions: Dict[str, str] = {}
         self.bets: Dict[str, str] = {}
+        self._empty_key: tuple = None
+        self._empty_actions: Dict[str, str] = {}
+        self._empty_bets: Dict[str, str] = {}
 
-        self.prev_hash: str = ""
+        self.prev_hash: int = 0
+        self._last_json: str = ""
         self.folded_players: set = set()
         self.last_street_count: int = 0
         
         self.last_hero_cards = []
         self.last_board = []
         self.hand_just_ended = False
+        
+        # Text read for each region during the current refresh, and the
+        # last text per region keyed by a hash of its pixels
+        self._texts: Dict[tuple, List[str]] = {}
+        self._ocr_cache: Dict[tuple, Tuple[bytes, List[str]]] = {}
+        self._color_frame: Optional[np.ndarray] = None
+        self._frame: Optional[np.ndarray] = None
+        self._table_digest: bytes = b""
+        # Output buffers for colour conversion and resizing, reused every tick
+        self._bufs: Dict[object, np.ndarray] = {}
+        
+        # Throwaway passes so the first real refresh doesn't pay for lazy init.
+        # Noise rather than zeros, since blank tiles never reach the reader
+        noise = np.random.default_rng(0).integers(
+            0, 256, (int((SCREEN_REGION[3] - SCREEN_REGION[1]) * 1.5),
+                     int((SCREEN_REGION[2] - SCREEN_REGION[0]) * 1.5)), dtype=np.uint8)
+        for _ in range(OCR_WARMUP_RUNS):
+            self._read_regions(noise, [POT_REGION, *self._BOARD_REGIONS])
+            self._ocr_cache.clear()
+        self._texts = {}
+        ocr_kernels.warmup()
+        print(f"OCR reader ready ({backend})")
+
+    def _capture(self, region):
+        """Grab a region as a BGRA array without copying the mss buffer"""
+        raw = self._sct.grab({
+            "left": region[0], "top": region[1],
+            "width": region[2] - region[0], "height": region[3] - region[1]
+        })
+        # raw.raw is mss's own bytearray; raw.bgra would copy it into bytes first
+        return np.frombuffer(raw.raw, dtype=np.uint8).reshape(raw.height, raw.width, 4)
+
+    def _buf(self, key, shape):
+        """Reusable uint8 output buffer, reallocated only if the shape changes"""
+        buf = self._bufs.get(key)
+        if buf is None or buf.shape != shape:
+            buf = self._bufs[key] = np.empty(shape, dtype=np.uint8)
+        return buf
+
+    def _convert(self, key, bgra, color):
+        """BGRA to BGR or grayscale into a reused buffer"""
+        h, w = bgra.shape[:2]
+        if color:
+            return cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR, dst=self._buf((key, 'bgr'), (h, w, 3)))
+        return cv2.cvtColor(bgra, cv2.COLOR_BGRA2GRAY, dst=self._buf((key, 'gray'), (h, w)))
+
+    def _upscale(self, key, img):
+        """1.5x linear upscale into a reused buffer"""
+        h, w = int(img.shape[0] * 1.5), int(img.shape[1] * 1.5)
+        dst = self._buf((key, 'up'), (h, w) + img.shape[2:])
+        return cv2.resize(img, (w, h), dst=dst, interpolation=cv2.INTER_LINEAR)
 
-    def _grab(self, region, color=False):
-        """Keep original grab method but with slight performance improvement"""
-        img = np.array(ImageGrab.grab(bbox=region))
-        img = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-        if not color:
-            img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        return cv2.resize(img, (0, 0), fx=1.5, fy=1.5, interpolation=cv2.INTER_LINEAR)
+    def _grab_raw(self, region, color=False):
+        """Grab a region as BGR or grayscale at screen resolution"""
+        return self._convert(region, self._capture(region), color)
 
-    def _text(self, region, color=False):
-        """Keep original text method"""
-        return self.reader.readtext(self._grab(region, color), detail=0)
+    def capture_table(self):
+        """BGRA capture of SCREEN_REGION, shared by table_changed and refresh_all"""
+        return self._capture(SCREEN_REGION)
+
+    def table_changed(self, bgra) -> bool:
+        """Cheap whole-table check: hash a small thumbnail of a capture_table() grab"""
+        gray = self._convert('table', bgra, False)
+        small = cv2.resize(gray, TABLE_HASH_SIZE, dst=self._buf('thumb', TABLE_HASH_SIZE[::-1]),
+                           interpolation=cv2.INTER_AREA)
+        digest = hashlib.blake2b(small.tobytes(), digest_size=8).digest()
+        if digest == self._table_digest:
+            return False
+        self._table_digest = digest
+        return True
+
+    def _grab_frame(self, bgra=None):
+        """Capture SCREEN_REGION once: BGR for colour tiles, upscaled gray for OCR"""
+        if bgra is None:
+            bgra = self.capture_table()
+        self._color_frame = self._convert('frame', bgra, True)
+        self._frame = self._upscale('frame', self._convert('frame', bgra, False))
+        return self._frame
+
+    def _color_tile(self, region):
+        """BGR tile of a region cut from this refresh's frame"""
+        if self._color_frame is None:
+            return self._grab_raw(region, color=True)
+        ox, oy = SCREEN_REGION[0], SCREEN_REGION[1]
+        return self._color_frame[region[1] - oy:region[3] - oy, region[0] - ox:region[2] - ox]
+
+    @staticmethod
+    def _frame_box(region):
+        """Region in SCREEN_REGION frame pixels as [x_min, x_max, y_min, y_max]"""
+        ox, oy = SCREEN_REGION[0], SCREEN_REGION[1]
+        return [int((region[0] - ox) * 1.5), int((region[2] - ox) * 1.5),
+                int((region[1] - oy) * 1.5), int((region[3] - oy) * 1.5)]
+
+    @staticmethod
+    def _blank(img):
+        """True for near-uniform grayscale tiles (empty seats, missing cards) not worth OCR"""
+        if img.size == 0:
+            return True
+        _, stddev = cv2.meanStdDev(img)
+        return stddev[0, 0] < BLANK_STDDEV
+
+    def _read_regions(self, frame, regions):
+        """Recognize text for many regions of one SCREEN_REGION frame in one reader call"""
+        # Regions whose pixels match the last read reuse its text
+        pending = []
+        for region in regions:
+            x0, x1, y0, y1 = box = self._frame_box(region)
+            tile = frame[y0:y1, x0:x1]
+            digest = hashlib.blake2b(tile.tobytes(), digest_size=8).digest()
+            cached = self._ocr_cache.get(region)
+            if cached and cached[0] == digest:
+                self._texts[region] = cached[1]
+            elif self._blank(tile):
+                self._texts[region] = []
+                self._ocr_cache[region] = (digest, [])
+            else:
+                pending.append((region, box, digest))
+        if not pending:
+            return
+        boxes = [box for _, box, _ in pending]
+        
+        if self.onnx_recognizer:
+            texts = self.onnx_recognizer.recognize([frame[y0:y1, x0:x1] for x0, x1, y0, y1 in boxes])
+        else:
+            # EasyOCR may reorder its output, so map results back by box corner
+            results = self.reader.recognize(frame, horizontal_list=boxes, free_list=[],
+                                            detail=1, batch_size=OCR_BATCH_SIZE)
+            by_corner = {(int(box[0][0]), int(box[0][1])): text for box, text, _ in results}
+            texts = [by_corner.get((b[0], b[2]), "") for b in boxes]
+        
+        for (region, _, digest), text in zip(pending, texts):
+            self._texts[region] = [text] if text.strip() else []
+            self._ocr_cache[region] = (digest, self._texts[region])
+
+    def _text(self, region):
+        """Text read for a region this refresh, reading it now if it wasn't batched"""
+        if region not in self._texts:
+            frame = self._frame if self._frame is not None else self._grab_frame()
+            self._read_regions(frame, [region])
+        return self._texts[region]
 
     def _first(self, region):
         """Keep original _first method"""
@@ -89,40 +249,19 @@ class OCR:
         return "N/A"
 
     def _suit(self, region):
-        rgb = np.mean(self._grab(region, color=True).reshape(-1, 3), axis=0)
-        suit_rgb = {'♣': (27, 108, 27), '♥': (21, 82, 145), '♦': (162, 32, 33), '♠': (41, 43, 41)}
-        dist = lambda a, b: np.sqrt(((np.array(a) - b) ** 2).sum())
-        return min(suit_rgb, key=lambda s: dist(rgb, suit_rgb[s]))
+        """Nearest suit colour to the region's mean colour"""
+        return self._SUIT_KEYS[ocr_kernels.nearest_palette(self._color_tile(region), self._SUIT_PALETTE_BGR)]
 
     def _smart_card_correction(self, text_raw):
         """NEW: Conservative OCR correction for card values only"""
         if not text_raw:
             return None
             
-        text = text_raw.strip().upper()
-        
-        valid_cards = ['A', 'K', 'Q', 'J', '10', '2', '3', '4', '5', '6', '7', '8', '9']
-        if text in valid_cards:
-            return text
-        
-        corrections = {
-            '0': 'Q',      # Zero often misread as Q
-            'O': 'Q',      # Letter O misread as Q  
-        }
-        
-        if text in corrections:
-            return corrections[text]
-            
-        # various ways OCR might see 10
-        if text in ['10', 'TO', '1O', 'IO', 'LO']:
-            return '10'
-            
-        if text.isdigit() and len(text) == 1:
-            digit = int(text)
-            if 2 <= digit <= 9:
-                return text
-                
-        return None
+        m = CARD_VALUE_PATTERN.match(text_raw)
+        if not m:
+            return None
+        value = m.group(1).upper()
+        return CARD_VALUE_FIXES.get(value, value)
 
     def _hero_cards(self):
         """UPDATED: Hero card detection with smart correction"""
@@ -142,10 +281,7 @@ class OCR:
     def _board(self):
         """UPDATED: Board detection with smart correction"""
         cards = []
-        boards = [BOARD_CARD_1, BOARD_CARD_2, BOARD_CARD_3, BOARD_CARD_4, BOARD_CARD_5]
-        suits = [SUIT_CARD_1, SUIT_CARD_2, SUIT_CARD_3, SUIT_CARD_4, SUIT_CARD_5]
-        
-        for r, s in zip(boards, suits):
+        for r, s in zip(self._BOARD_REGIONS, self._BOARD_SUIT_REGIONS):
             card_texts = self._text(r)
             if card_texts:
                 corrected_value = self._smart_card_correction(card_texts[0])
@@ -156,95 +292,81 @@ class OCR:
 
     def _bankrolls(self):
         """Keep ORIGINAL bankroll detection logic"""
-        regs = {
-            "Hero": BANK_HERO, "Player 2": BANK_PLAYER_2, "Player 3": BANK_PLAYER_3,
-            "Player 4": BANK_PLAYER_4, "Player 5": BANK_PLAYER_5,
-            "Player 6": BANK_PLAYER_6, "Player 7": BANK_PLAYER_7
-        }
-        br = {p: self._first(r) for p, r in regs.items()}
+        br = {p: self._first(r) for p, r in self._BANK_REGIONS}
         self.seated_players = [p for p, v in br.items() if v != "N/A"]
         return br
 
-    def _vpips(self):
-        """Keep ORIGINAL VPIP detection logic"""
-        regs = {
-            "Hero": VPIP_HERO, "Player 2": VPIP_PLAYER_2, "Player 3": VPIP_PLAYER_3,
-            "Player 4": VPIP_PLAYER_4, "Player 5": VPIP_PLAYER_5,
-            "Player 6": VPIP_PLAYER_6, "Player 7": VPIP_PLAYER_7
-        }
-        return {p: self._first(r) + "%" for p, r in regs.items() if p in self.seated_players}
-
-    def _positions(self):
-        """Keep ORIGINAL position detection logic"""
-        btn_rgb = (99, 182, 231)
-        regs = {
-            "Hero": POSITION_HERO, "Player 2": POSITION_PLAYER_2, "Player 3": POSITION_PLAYER_3,
-            "Player 4": POSITION_PLAYER_4, "Player 5": POSITION_PLAYER_5,
-            "Player 6": POSITION_PLAYER_6, "Player 7": POSITION_PLAYER_7
-        }
-        dist = lambda a, b: np.sqrt(((np.array(a) - b) ** 2).sum())
-        dists = {}
-        for p in self.seated_players:
-            try:
-                avg = np.mean(self._grab(regs[p], color=True).reshape(-1, 3), axis=0)
-                dists[p] = dist(avg, btn_rgb)
-            except:
-                dists[p] = float('inf')
-        
+    def _action(self, p, region):
+        """Action shown for a seat; fold beats raise beats call, folds stick for the hand"""
+        found = {w.lower() for w in ACTION_PATTERN.findall(" ".join(self._text(region)))}
+        if "fold" in found:
+            self.folded_players.add(p)
+        if p in self.folded_players:
+            return "Fold"
+        for word in ACTION_PRIORITY:
+            if word in found:
+                return ACTION_NAMES[word]
+        return "--"
+
+    def _empty_rows(self):
+        """Default action/bet dicts, rebuilt only when the seated players change"""
+        key = tuple(self.seated_players)
+        if key != self._empty_key:
+            self._empty_key = key
+            self._empty_actions = dict.fromkeys(key, "--")
+            self._empty_bets = dict.fromkeys(key, "N/A")
+        return self._empty_actions, self._empty_bets
+
+    def _button_order(self, dists):
+        """Label seats clockwise from the seat nearest the dealer-button colour"""
         if not dists:
-            return {p: "--" for p in self.seated_players}
+            return self._empty_rows()[0]
             
         btn = min(dists, key=dists.get)
         try:
-            order = self.seated_players[self.seated_players.index(btn):] + self.seated_players[:self.seated_players.index(btn)]
-            labels = ["BTN", "SB", "BB", "UTG", "MP", "CO", "HJ"][:len(order)]
-            return dict(zip(order, labels))
-        except:
-            return {p: "--" for p in self.seated_players}
-
-    def _actions(self):
-        """Keep ORIGINAL action detection logic"""
-        regs = {
-            "Hero": ACTION_HERO, "Player 2": ACTION_2, "Player 3": ACTION_3,
-            "Player 4": ACTION_4, "Player 5": ACTION_5,
-            "Player 6": ACTION_6, "Player 7": ACTION_7
-        }
-        acts = {}
+            i = self.seated_players.index(btn)
+            order = self.seated_players[i:] + self.seated_players[:i]
+            return dict(zip(order, self._POSITION_LABELS))
+        except ValueError:
+            return self._empty_rows()[0]
+
+    def _players(self, new_street):
+        """VPIP, position, action and bet for every seated player in one pass"""
+        vpips, dists, acts, bets = {}, {}, {}, {}
+        if new_street:
+            acts, bets = self._empty_rows()
         for p in self.seated_players:
-            if p in regs:
-                words = " ".join(self._text(regs[p])).lower()
-                if "fold" in words:
-                    self.folded_players.add(p)
-                    acts[p] = "Fold"
-                elif p in self.folded_players:
-                    acts[p] = "Fold"
-                elif "raise" in words:
-                    acts[p] = "Raise"
-                elif "call" in words:
-                    acts[p] = "Call"
-                else:
-                    acts[p] = "--"
-            else:
-                acts[p] = "--"
-        return acts
-
-    def _bets(self):
-        """Keep ORIGINAL bet detection logic"""
-        regs = {
-            "Hero": BET_AMOUNT_HERO, "Player 2": BET_AMOUNT_2, "Player 3": BET_AMOUNT_3,
-            "Player 4": BET_AMOUNT_4, "Player 5": BET_AMOUNT_5,
-            "Player 6": BET_AMOUNT_6, "Player 7": BET_AMOUNT_7
-        }
-        return {p: self._first(regs[p]) for p in self.seated_players}
-
-    def refresh_all(self) -> Optional[str]:
+            _, vpip_r, pos_r, act_r, bet_r = self._SEAT_REGIONS[p]
+            vpips[p] = self._first(vpip_r) + "%"
+            try:
+                dists[p] = float(ocr_kernels.colour_distance(self._color_tile(pos_r), self._BTN_BGR))
+            except:
+                dists[p] = float('inf')
+            if not new_street:
+                acts[p], bets[p] = self._action(p, act_r), self._first(bet_r)
+        return vpips, self._button_order(dists), acts, bets
+
+    def _save_state(self, json_state):
+        """Write game_state.json atomically so readers never see a partial file"""
+        tmp = STATE_PATH + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(json_state)
+            os.replace(tmp, STATE_PATH)
+            self._last_json = json_state
+        except Exception as e:
+            print(f"Warning: Could not save game state: {e}")
+
+    def refresh_all(self, bgra=None) -> Optional[str]:
         """Keep ORIGINAL refresh logic with hand reset detection"""
+        self._texts = {}
+        frame = self._grab_frame(bgra)
+        self._read_regions(frame, [POT_REGION, *self._BOARD_REGIONS, HERO_CARD_1, HERO_CARD_2,
+                                   *(r for _, r in self._BANK_REGIONS)])
         pot = self._pot()
         board = self._board()
         hero = self._hero_cards()
         self.bankrolls = self._bankrolls()
-        self.vpips = self._vpips()
-        self.positions = self._positions()
 
         hand_reset = False
         
@@ -264,17 +386,25 @@ class OCR:
                 hand_reset = True
                 print(f"Hand reset detected: New cards {hero} (was {self.last_hero_cards})")
 
+        if hand_reset:
+            self._ocr_cache.clear()
+
         # Check for street change
         street = len(board)
-        if street != self.last_street_count or hand_reset:
-            self.actions = {p: "--" for p in self.seated_players}
-            self.bets = {p: "N/A" for p in self.seated_players}
+        new_street = street != self.last_street_count or hand_reset
+        
+        # Second batch: per-player text, only for seated players
+        regions = []
+        for p in self.seated_players:
+            _, vpip_r, _, act_r, bet_r = self._SEAT_REGIONS[p]
+            regions += (vpip_r,) if new_street else (vpip_r, act_r, bet_r)
+        self._read_regions(frame, regions)
+        self.vpips, self.positions, self.actions, self.bets = self._players(new_street)
+        
+        if new_street:
             if hand_reset:
                 self.folded_players = set()  
             self.last_street_count = street
-        else:
-            self.actions = self._actions()
-            self.bets = self._bets()
 
         snapshot = (pot, tuple(board), tuple(hero),
                     tuple(sorted(self.bankrolls.items())),
@@ -282,7 +412,7 @@ class OCR:
                     tuple(sorted(self.positions.items())),
                     tuple(sorted(self.actions.items())),
                     tuple(sorted(self.bets.items())))
-        hash_ = str(snapshot)
+        hash_ = hash(snapshot)
         
         changed = hash_ != self.prev_hash or hand_reset
         json_state = None
@@ -295,11 +425,8 @@ class OCR:
             self.state.update_players(self.bankrolls, self.vpips, self.positions, self.actions, self.bets)
             json_state = self.state.to_json()
             
-            try:
-                with open("game_state.json", "w", encoding="utf-8") as f:
-                    f.write(json_state)
-            except Exception as e:
-                print(f"Warning: Could not save game state: {e}")
+            if json_state != self._last_json:
+                self._save_state(json_state)
             
             if hand_reset or len(hero) == 2 or len(board) != len(self.last_board):
                 print("=== GAME STATE UPDATE ===")
@@ -339,16 +466,22 @@ class OCR:
                     self.bets.get(p, "--")
                 ))
 
+    def _wait_for_quit(self, stop):
+        """Set stop once 'q' is entered on stdin; a closed stdin keeps running"""
+        for line in sys.stdin:
+            if line.strip().lower() == 'q':
+                stop.set()
+                return
+
     def start(self):
-        print("OCR started – press q to quit")
-        self.refresh_all()
-        while True:
-            json_state = self.refresh_all()
-            if json_state:
-                pass
-            if cv2.waitKey(1) & 0xFF == ord('q'):
-                break
-            time.sleep(SCAN_DELAY)
+        print("OCR started – type q and press Enter to quit")
+        stop = threading.Event()
+        threading.Thread(target=self._wait_for_quit, args=(stop,), daemon=True).start()
+        while not stop.is_set():
+            table = self.capture_table()
+            if self.table_changed(table):
+                self.refresh_all(table)
+            stop.wait(SCAN_DELAY)
 
 if __name__ == "__main__":
     print("Testing OCR...")
@@ -0,0 +1,76 @@
+"""
+OCR Colour Kernels
+
+Fused mean-colour / nearest-colour kernels used for suit and dealer-button
+detection. Compiled with Numba when it is installed, otherwise the same
+functions fall back to cv2.mean plus a small NumPy distance.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, nogil=True, fastmath=True)
+    def _channel_means(img):
+        """Per-channel mean of an H x W x 3 uint8 tile in one pass"""
+        h, w = img.shape[0], img.shape[1]
+        s0 = np.int64(0)
+        s1 = np.int64(0)
+        s2 = np.int64(0)
+        for y in range(h):
+            for x in range(w):
+                s0 += img[y, x, 0]
+                s1 += img[y, x, 1]
+                s2 += img[y, x, 2]
+        n = max(h * w, 1)
+        return s0 / n, s1 / n, s2 / n
+
+    @njit(cache=True, nogil=True, fastmath=True)
+    def nearest_palette(img, palette):
+        """Index of the palette colour closest to the tile's mean colour"""
+        m0, m1, m2 = _channel_means(img)
+        best = 0
+        best_dist = np.inf
+        for i in range(palette.shape[0]):
+            d0 = m0 - palette[i, 0]
+            d1 = m1 - palette[i, 1]
+            d2 = m2 - palette[i, 2]
+            dist = d0 * d0 + d1 * d1 + d2 * d2
+            if dist < best_dist:
+                best_dist = dist
+                best = i
+        return best
+
+    @njit(cache=True, nogil=True, fastmath=True)
+    def colour_distance(img, colour):
+        """Squared distance between the tile's mean colour and a colour"""
+        m0, m1, m2 = _channel_means(img)
+        d0 = m0 - colour[0]
+        d1 = m1 - colour[1]
+        d2 = m2 - colour[2]
+        return d0 * d0 + d1 * d1 + d2 * d2
+else:
+    import cv2
+
+    def nearest_palette(img, palette):
+        """Index of the palette colour closest to the tile's mean colour"""
+        avg = np.array(cv2.mean(img)[:3], dtype=np.float32)
+        return int(np.argmin(((palette - avg) ** 2).sum(axis=1)))
+
+    def colour_distance(img, colour):
+        """Squared distance between the tile's mean colour and a colour"""
+        avg = np.array(cv2.mean(img)[:3], dtype=np.float32)
+        return float(((avg - colour) ** 2).sum())
+
+def warmup():
+    """Compile the kernels up front so the first refresh doesn't pay for it"""
+    # A strided view, like the frame slices _color_tile hands in, so Numba
+    # compiles the non-contiguous layout used at runtime
+    tile = np.zeros((4, 4, 3), dtype=np.uint8)[1:3, 1:3]
+    palette = np.zeros((4, 3), dtype=np.float32)
+    nearest_palette(tile, palette)
+    colour_distance(tile, palette[0])
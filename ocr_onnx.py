@@ -0,0 +1,85 @@
+"""
+ONNX Runtime Recognizer
+
+int8-quantized replacement for EasyOCR's recognizer on CPU-only machines.
+Run this module once to export and quantize the model, after which OCR
+picks up rec.int8.onnx automatically when no GPU is available.
+"""
+import os
+import math
+import cv2
+import numpy as np
+from typing import List
+
+REC_MODEL_PATH = "rec.onnx"
+REC_INT8_MODEL_PATH = "rec.int8.onnx"
+REC_HEIGHT = 64   # EasyOCR recognizer input height
+REC_WIDTH = 512   # Covers the widest configured region (BANK_HERO, ~400 px at this height)
+
+def export_recognizer(reader, path=REC_MODEL_PATH, int8_path=REC_INT8_MODEL_PATH):
+    """Export the EasyOCR recognizer to ONNX and quantize its weights to int8"""
+    import torch
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    model = reader.recognizer
+    model = getattr(model, 'module', model)  # Unwrap DataParallel
+    model.eval()
+
+    class ImageOnly(torch.nn.Module):
+        """The recognizer ignores its text input, so leave it out of the graph"""
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, image):
+            return self.model(image, None)
+
+    dummy = torch.zeros(1, 1, REC_HEIGHT, REC_WIDTH)
+    torch.onnx.export(
+        ImageOnly(model), dummy, path,
+        input_names=['image'], output_names=['preds'],
+        dynamic_axes={'image': {0: 'batch', 3: 'width'}, 'preds': {0: 'batch', 1: 'steps'}},
+        opset_version=12
+    )
+    quantize_dynamic(path, int8_path, weight_type=QuantType.QInt8)
+    print(f"Saved {int8_path}")
+
+class OnnxRecognizer:
+    """Recognize grayscale text crops with the quantized ONNX model"""
+    def __init__(self, converter, model_path=REC_INT8_MODEL_PATH):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = max(1, (os.cpu_count() or 2) // 2)
+        options.inter_op_num_threads = 1  # The graph is a single chain, nothing to run in parallel
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            model_path, sess_options=options, providers=['CPUExecutionProvider']
+        )
+        self.input_name = self.session.get_inputs()[0].name
+        self.converter = converter  # EasyOCR's CTC label converter
+
+    def _prepare(self, img):
+        """Resize to model height, normalize to [-1, 1] and edge-pad to REC_WIDTH"""
+        h, w = img.shape[:2]
+        width = min(REC_WIDTH, max(1, math.ceil(REC_HEIGHT * w / h)))
+        img = cv2.resize(img, (width, REC_HEIGHT), interpolation=cv2.INTER_CUBIC)
+        img = (img.astype(np.float32) / 255.0 - 0.5) / 0.5
+        if width < REC_WIDTH:
+            img = np.pad(img, ((0, 0), (0, REC_WIDTH - width)), mode='edge')
+        return img[np.newaxis]
+
+    def recognize(self, images) -> List[str]:
+        """Return one string per grayscale image"""
+        if not images:
+            return []
+        batch = np.stack([self._prepare(img) for img in images])
+        preds = self.session.run(None, {self.input_name: batch})[0]
+        indices = preds.argmax(axis=2)
+        return self.converter.decode_greedy(indices.reshape(-1), [indices.shape[1]] * indices.shape[0])
+
+if __name__ == "__main__":
+    import easyocr
+    print("Exporting EasyOCR recognizer...")
+    export_recognizer(easyocr.Reader(['en'], gpu=False, verbose=False))
@@ -0,0 +1,131 @@
+"""
+OCR Worker Process
+
+Runs screen capture and EasyOCR in a child process so OCR does not hold
+the GIL of the overlay process. The parent sends refresh requests over a
+Pipe and gets back the JSON update plus the fields it needs to mirror
+into its own GameState.
+"""
+import threading
+import multiprocessing as mp
+from typing import Optional
+from game_state import GameState
+
+OCR_START_TIMEOUT = 180   # Seconds; the first start may download EasyOCR models
+OCR_REFRESH_TIMEOUT = 10  # Seconds before a refresh counts as hung
+
+def _ocr_loop(conn):
+    """Child process: own the OCR reader and answer refresh requests"""
+    from ocr import OCR
+
+    game_state = GameState()
+    ocr = OCR(game_state)
+    conn.send("ready")
+
+    while True:
+        try:
+            msg = conn.recv()
+        except EOFError:
+            break
+        if msg is None:
+            break
+
+        try:
+            # Nothing on the table moved, so skip OCR and report no change
+            table = ocr.capture_table()
+            json_state = ocr.refresh_all(table) if ocr.table_changed(table) else None
+            fields = {
+                'pot': game_state.pot,
+                'board': game_state.board,
+                'hero_cards': game_state.hero_cards,
+                'players': game_state.players
+            }
+            conn.send((json_state, fields, None))
+        except Exception as e:
+            conn.send((None, None, f"{type(e).__name__}: {e}"))
+
+    conn.close()
+
+class OCRProcess:
+    """Drop-in replacement for OCR that runs refresh_all in a subprocess"""
+    def __init__(self, game_state):
+        self.state = game_state
+        self._lock = threading.Lock()  # The Connection is shared by the worker and cleanup threads
+        self._closed = False
+        self._proc = None
+        self._start()
+
+    def _start(self):
+        """Start the child and wait until its reader is loaded"""
+        self._conn, child_conn = mp.Pipe()
+        self._proc = mp.Process(target=_ocr_loop, args=(child_conn,), daemon=True)
+        self._proc.start()
+        child_conn.close()
+
+        try:
+            ready = self._conn.poll(OCR_START_TIMEOUT) and self._conn.recv() == "ready"
+        except (EOFError, OSError):
+            ready = False
+        if not ready:
+            self._proc.join(timeout=2)
+            exitcode = self._proc.exitcode
+            self._kill()
+            raise RuntimeError(f"OCR process failed to start (exit code {exitcode})")
+
+    def _kill(self):
+        """Terminate the child; the next refresh starts a new one"""
+        if self._proc is not None and self._proc.is_alive():
+            self._proc.terminate()
+            self._proc.join(timeout=2)
+        self._proc = None
+        self._conn.close()
+
+    def refresh_all(self) -> Optional[str]:
+        """Refresh OCR in the child and mirror the result into game_state"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("OCR process closed")
+            if self._proc is None:
+                print("Restarting OCR process")
+                self._start()
+            try:
+                self._conn.send("refresh")
+                if not self._conn.poll(OCR_REFRESH_TIMEOUT):
+                    self._kill()
+                    raise RuntimeError("OCR process timed out")
+                json_state, fields, error = self._conn.recv()
+            except (EOFError, OSError) as e:
+                self._kill()
+                raise RuntimeError(f"OCR process died: {e}")
+
+        if error:
+            raise RuntimeError(f"OCR process error: {error}")
+
+        self.state.update_pot(fields['pot'])
+        self.state.update_board(fields['board'])
+        self.state.update_hero_cards(fields['hero_cards'])
+        self.state.players = fields['players']
+        return json_state
+
+    def close(self):
+        """Stop the child process"""
+        if not self._lock.acquire(timeout=OCR_REFRESH_TIMEOUT):
+            # A refresh is still stuck on the child, so don't touch the Connection
+            self._closed = True
+            proc = self._proc
+            if proc is not None:
+                proc.terminate()
+            return
+        try:
+            self._closed = True
+            if self._proc is None:
+                return
+            try:
+                self._conn.send(None)
+            except (EOFError, OSError):
+                pass
+            self._proc.join(timeout=2)
+            if self._proc.is_alive():
+                self._proc.terminate()
+        finally:
+            self._lock.release()